@@ -2,9 +2,9 @@ import os
 import sys
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import struct
-import re
-from struct import pack
+from concurrent.futures import ThreadPoolExecutor
+
+from palette_core import convert_act_to_gpl, convert_gpl_to_act
 
 # ==========================================
 # FIX: TCL/TK Library Discovery
@@ -20,7 +20,32 @@ def fix_tcl_env():
     if sys.platform != 'win32':
         return
 
+    # Only needed for the path cache, so other platforms don't import them
+    import json
+    import tempfile
+
+    # Helper to check if a path looks like a valid tcl library (contains init.tcl)
+    def is_valid_tcl_lib(path):
+        return os.path.exists(os.path.join(path, "init.tcl"))
+
     try:
+        # Resolved paths are cached per Python version so later launches skip the search
+        cache_path = os.path.join(
+            os.environ.get('LOCALAPPDATA', tempfile.gettempdir()),
+            "gpltoact",
+            "tcl-{0}.{1}.json".format(*sys.version_info[:2]),
+        )
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('executable') == sys.executable and is_valid_tcl_lib(cached['tcl']):
+                os.environ['TCL_LIBRARY'] = cached['tcl']
+                if cached.get('tk'):
+                    os.environ['TK_LIBRARY'] = cached['tk']
+                return
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            pass  # Missing or stale cache, fall back to the full search
+
         base_paths = [
             os.path.dirname(sys.executable),  # e.g. .venv/Scripts
             os.path.dirname(os.path.dirname(sys.executable)), # e.g. .venv
@@ -36,43 +61,40 @@ def fix_tcl_env():
         tcl_library = None
         tk_library = None
 
-        # Helper to check if a path looks like a valid tcl library (contains init.tcl)
-        def is_valid_tcl_lib(path):
-            return os.path.exists(os.path.join(path, "init.tcl"))
-
         for base in base_paths:
-            # Look in tcl/tcl8.6, tcl8.6, lib/tcl8.6, etc.
+            # Look in tcl/tcl8.x, lib/tcl8.x or tcl8.x at the root.
             # Common locations:
             # - Python/tcl/tcl8.6
             # - Python/Lib/tcl8.6
-            # - Python/share/tcl8.6
-            
-            candidates = [
-                os.path.join(base, "tcl", "tcl8.6"),
-                os.path.join(base, "tcl", "tcl8.7"), # Future proofing
-                os.path.join(base, "lib", "tcl8.6"), # Python standard
-                os.path.join(base, "tcl8.6"),         # Sometimes at root
-            ]
-            
-            # Use os.walk for a deeper search if needed, but sticking to candidates first for speed
-            for cand in candidates:
-                if is_valid_tcl_lib(cand):
-                    tcl_library = cand
-                    # TK usually is sibling
-                    parent = os.path.dirname(cand)
-                    tk_candidates = [
-                         os.path.join(parent, "tk8.6"),
-                         os.path.join(parent, "tk8.7"),
-                    ]
-                    for tk_cand in tk_candidates:
-                        if os.path.exists(tk_cand):
-                            tk_library = tk_cand
+            # - Python/tcl8.6
+            # One scandir per parent lists the tcl and tk siblings together
+            for parent in (os.path.join(base, "tcl"), os.path.join(base, "lib"), base):
+                try:
+                    with os.scandir(parent) as it:
+                        dirs = sorted(e.name for e in it if e.is_dir())
+                except OSError:
+                    continue
+
+                for name in dirs:
+                    if name.startswith("tcl") and name[3:4].isdigit():
+                        cand = os.path.join(parent, name)
+                        if is_valid_tcl_lib(cand):
+                            tcl_library = cand
                             break
+
+                if tcl_library:
+                    # TK usually is sibling, prefer the matching version
+                    tk_names = [n for n in dirs if n.startswith("tk") and n[2:3].isdigit()]
+                    version = os.path.basename(tcl_library)[3:]
+                    if "tk" + version in tk_names:
+                        tk_library = os.path.join(parent, "tk" + version)
+                    elif tk_names:
+                        tk_library = os.path.join(parent, tk_names[0])
                     break
-            
+
             if tcl_library:
                 break
-        
+
         # Super-force fallback if still finding nothing but we know the path from the error log
         if not tcl_library:
              # Try specifically the Python 3.13 tcl path seen in error
@@ -88,6 +110,12 @@ def fix_tcl_env():
             if tk_library:
                  print(f"DEBUG: Found TK_LIBRARY at {tk_library}")
                  os.environ['TK_LIBRARY'] = tk_library
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    json.dump({'executable': sys.executable, 'tcl': tcl_library, 'tk': tk_library}, f)
+            except OSError as e:
+                print(f"Warning: Could not cache TCL paths: {e}")
         else:
             print("WARNING: Could not automatically find TCL/TK libraries.")
 
@@ -96,56 +124,6 @@ def fix_tcl_env():
 
 fix_tcl_env()
 
-# ==========================================
-# CORE FUNCTIONS
-# ==========================================
-
-def parse_adobe_act(filename):
-    filesize = os.path.getsize(filename)
-    with open(filename, 'rb') as file:
-        if filesize == 772:  # CS2
-            file.seek(768, 0)
-            nbcolors = struct.unpack('>H', file.read(2))[0]
-            file.seek(0, 0)
-        else:
-            nbcolors = filesize // 3
-        return [struct.unpack('3B', file.read(3)) for i in range(nbcolors)]
-
-def return_gimp_palette(colors, name, columns=0):
-    return 'GIMP Palette\nName: {name}\nColumns: {columns}\n#\n{colors}\n'.format(
-        name=name,
-        columns=columns,
-        colors='\n'.join(
-            '{0} {1} {2}\tUntitled'.format(*color) for color in colors
-        ),
-    )
-
-def parse_gpl_file(filename):
-    colors = []
-    with open(filename, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            parts = re.split(r'\s+', line.strip())
-            try:
-                nums = [int(x) for x in parts if x.isdigit()][:3]
-                if len(nums) >= 3:
-                    r, g, b = [max(0, min(255, x)) for x in nums[:3]]
-                    colors.append((r, g, b))
-            except (ValueError, IndexError):
-                continue
-    return colors
-
-def create_act_file(colors, output_filename):
-    with open(output_filename, 'wb') as f:
-        for r, g, b in colors[:256]:
-            f.write(pack('3B', r, g, b))
-        for _ in range(256 - len(colors)):
-            f.write(pack('3B', 0, 0, 0))
-        if len(colors) > 0 and len(colors) < 256:
-            f.write(pack('>H', len(colors)))
-
 # ==========================================
 # GUI APP
 # ==========================================
@@ -175,6 +153,11 @@ class PaletteConverterApp(tk.Tk):
         self.style.theme_use('clam')
         self._configure_styles()
         
+        # Conversions run on a worker thread so the window stays responsive
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        # Convert buttons whose job is still queued or running
+        self._busy = set()
+
         self._create_widgets()
 
     def _configure_styles(self):
@@ -375,13 +358,13 @@ class PaletteConverterApp(tk.Tk):
         self.btn_convert_gpl.pack(fill="x", pady=20)
 
     def _validate_act_input(self, *args):
-        if self.act_path_var.get().strip():
+        if self.act_path_var.get().strip() and self.btn_convert_act not in self._busy:
             self.btn_convert_act.configure(state="normal")
         else:
             self.btn_convert_act.configure(state="disabled")
 
     def _validate_gpl_input(self, *args):
-        if self.gpl_path_var.get().strip():
+        if self.gpl_path_var.get().strip() and self.btn_convert_gpl not in self._busy:
             self.btn_convert_gpl.configure(state="normal")
         else:
             self.btn_convert_gpl.configure(state="disabled")
@@ -401,48 +384,58 @@ class PaletteConverterApp(tk.Tk):
             # Should not happen if button disabled, but safe check
             return
 
-        try:
-            colors = parse_adobe_act(input_path)
-            
-            output_path = filedialog.asksaveasfilename(
-                defaultextension=".gpl",
-                initialfile=os.path.splitext(os.path.basename(input_path))[0] + ".gpl",
-                filetypes=[("GIMP Palette", "*.gpl")]
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".gpl",
+            initialfile=os.path.splitext(os.path.basename(input_path))[0] + ".gpl",
+            filetypes=[("GIMP Palette", "*.gpl")]
+        )
+
+        if output_path:
+            self._start_conversion(
+                self.btn_convert_act, self._validate_act_input,
+                convert_act_to_gpl, input_path, output_path
             )
-            
-            if output_path:
-                with open(output_path, 'w') as f:
-                    f.write(return_gimp_palette(colors, os.path.basename(output_path)))
-                messagebox.showinfo("Success", f"Converted successfully!\nSaved to: {output_path}")
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to convert:\n{str(e)}")
 
     def _convert_gpl_to_act(self):
         input_path = self.gpl_path_var.get()
         if not input_path:
             return
 
-        try:
-            colors = parse_gpl_file(input_path)
-            if not colors:
-                messagebox.showerror("Error", "No valid colors found in the GPL file.")
-                return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".act",
+            initialfile=os.path.splitext(os.path.basename(input_path))[0] + ".act",
+            filetypes=[("Adobe Palette", "*.act")]
+        )
 
-            output_path = filedialog.asksaveasfilename(
-                defaultextension=".act",
-                initialfile=os.path.splitext(os.path.basename(input_path))[0] + ".act",
-                filetypes=[("Adobe Palette", "*.act")]
+        if output_path:
+            self._start_conversion(
+                self.btn_convert_gpl, self._validate_gpl_input,
+                convert_gpl_to_act, input_path, output_path
             )
-            
-            if output_path:
-                create_act_file(colors, output_path)
-                messagebox.showinfo("Success", f"Converted successfully!\nSaved to: {output_path}")
 
+    def _start_conversion(self, button, validate, convert, input_path, output_path):
+        # Parse + write happen on the worker thread, the result is polled from the Tk loop
+        # The button stays disabled (even if the path is edited) until the job is done
+        self._busy.add(button)
+        button.configure(state="disabled")
+        future = self._pool.submit(convert, input_path, output_path)
+        self.after(50, self._poll_conversion, future, button, validate, output_path)
+
+    def _poll_conversion(self, future, button, validate, output_path):
+        if not future.done():
+            self.after(50, self._poll_conversion, future, button, validate, output_path)
+            return
+
+        # Re-enable only this job's button, based on its current input
+        self._busy.discard(button)
+        validate()
+
+        try:
+            future.result()
+            messagebox.showinfo("Success", f"Converted successfully!\nSaved to: {output_path}")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to convert:\n{str(e)}")
 
-
 if __name__ == "__main__":
     app = PaletteConverterApp()
     app.mainloop()
@@ -6,40 +6,15 @@
 # How to use:
 #   ./act_to_gpl.py some_palette.act > some_palette.gpl
 #
-# Code based on swatchbook/codecs/adobe_act.py from:
-# http://www.selapa.net/swatchbooker/
+# The parsing code lives in palette_core.py.
 
 
-import os.path
-import struct
 import sys
 
+from palette_core import parse_adobe_act, return_gimp_palette
 
-def parse_adobe_act(filename):
-    filesize = os.path.getsize(filename)
-    with open(filename, 'rb') as file:
-        if filesize == 772:  # CS2
-            file.seek(768, 0)
-            nbcolors = struct.unpack('>H', file.read(2))[0]
-            file.seek(0, 0)
-        else:
-            nbcolors = filesize // 3
-
-        # List of (R, G, B) tuples.
-        return [struct.unpack('3B', file.read(3)) for i in range(nbcolors)]
-
-
-def return_gimp_palette(colors, name, columns=0):
-    return 'GIMP Palette\nName: {name}\nColumns: {columns}\n#\n{colors}\n'.format(
-        name=name,
-        columns=columns,
-        colors='\n'.join(
-            '{0} {1} {2}\tUntitled'.format(*color)
-            for color in colors
-        ),
-    )
 
 if __name__ == '__main__':
-    sys.stdout.write(
+    sys.stdout.buffer.write(
         return_gimp_palette(parse_adobe_act(sys.argv[1]), sys.argv[1])
     )
@@ -3,60 +3,28 @@
 #
 # How to use:
 #   python gpl_to_act.py input.gpl output.act
+#   python gpl_to_act.py input_dir output_dir   (converts every *.gpl file)
 #
 # The script will create a standard ACT file with up to 256 colors.
 # If the palette has fewer than 256 colors, it will be padded with black.
 
 import os
-import re
 import sys
-from struct import pack
 
-def parse_gpl_file(filename):
-    """Parse a GIMP palette file and return a list of RGB tuples."""
-    colors = []
-    with open(filename, 'r', encoding='utf-8') as f:
-        # Skip header lines until we find the color data
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-                
-            # Look for lines with RGB values (3 or 4 numbers)
-            parts = re.split(r'\s+', line.strip())
-            try:
-                # Try to extract 3 or 4 numbers (RGB or RGBA)
-                nums = [int(x) for x in parts if x.isdigit()][:3]
-                if len(nums) >= 3:
-                    # Ensure values are in 0-255 range
-                    r, g, b = [max(0, min(255, x)) for x in nums[:3]]
-                    colors.append((r, g, b))
-            except (ValueError, IndexError):
-                continue
-    return colors
-
-def create_act_file(colors, output_filename):
-    """Create an ACT file from a list of RGB tuples."""
-    with open(output_filename, 'wb') as f:
-        # Write RGB values
-        for r, g, b in colors[:256]:  # ACT format supports max 256 colors
-            f.write(pack('3B', r, g, b))
-        
-        # If we have less than 256 colors, pad with black
-        for _ in range(256 - len(colors)):
-            f.write(pack('3B', 0, 0, 0))
-        
-        # Add color count for CS2 compatibility (optional, but some apps expect this)
-        if len(colors) > 0 and len(colors) < 256:
-            f.write(pack('>H', len(colors)))
+from palette_core import parse_gpl_file, create_act_file, convert_many
 
 def main():
     if len(sys.argv) != 3:
         print("Usage: python gpl_to_act.py input.gpl output.act")
+        print("       python gpl_to_act.py input_dir output_dir")
         sys.exit(1)
     
     input_file = sys.argv[1]
     output_file = sys.argv[2]
+
+    if os.path.isdir(input_file):
+        convert_dir(input_file, output_file)
+        return
     
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' not found.")
@@ -69,11 +37,46 @@ def main():
             sys.exit(1)
             
         create_act_file(colors, output_file)
-        print(f"Successfully converted {len(colors)} colors to {output_file}")
+        print(f"Successfully converted {len(colors) // 3} colors to {output_file}")
         
     except Exception as e:
         print(f"Error: {str(e)}")
         sys.exit(1)
 
+def convert_dir(input_dir, output_dir):
+    """Convert every GPL file in input_dir to an ACT file in output_dir."""
+    # scandir instead of glob: the directory name is not treated as a pattern
+    # and the extension match ignores case, like convert_file does
+    with os.scandir(input_dir) as it:
+        inputs = sorted(
+            entry.path for entry in it
+            if entry.is_file() and os.path.splitext(entry.name)[1].lower() == '.gpl'
+        )
+    if not inputs:
+        print(f"Error: No GPL files found in '{input_dir}'.")
+        sys.exit(1)
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+
+    pairs = [
+        (path, os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + '.act'))
+        for path in inputs
+    ]
+
+    failed = 0
+    for (input_file, output_file), result in zip(pairs, convert_many(pairs)):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"Error: {input_file}: {str(result)}")
+        else:
+            print(f"Successfully converted {result} colors to {output_file}")
+
+    if failed:
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
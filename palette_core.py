@@ -0,0 +1,216 @@
+# Shared palette reading/writing routines used by main.py, act_to_gpl.py
+# and the GUI.
+#
+# Palettes are passed around as flat, immutable bytes objects holding
+# R, G, B, R, G, B, ... (3 bytes per color), which is also the layout of
+# the ACT color table. Use rgb_tuples() to get a list of (R, G, B) tuples.
+#
+# ACT parsing code based on swatchbook/codecs/adobe_act.py from:
+# http://www.selapa.net/swatchbooker/
+
+
+import os
+import struct
+from functools import lru_cache
+from itertools import chain
+from struct import pack_into
+
+
+# ==========================================
+# PALETTE HELPERS
+# ==========================================
+
+def rgb_tuples(palette):
+    """Return a palette as a list of (R, G, B) tuples."""
+    return list(struct.iter_unpack('3B', palette))
+
+
+def _as_palette(colors):
+    # Accept legacy sequences of RGB tuples alongside flat palette bytes
+    if isinstance(colors, (bytes, bytearray, memoryview)):
+        return colors
+    return bytes(chain.from_iterable(colors))
+
+
+# ==========================================
+# ADOBE ACT -> GIMP GPL
+# ==========================================
+
+def parse_adobe_act(filename):
+    """Parse an Adobe ACT file and return its palette bytes."""
+    return _parse(filename, 'act')
+
+
+def _read_adobe_act(filename):
+    with open(filename, 'rb') as file:
+        data = file.read()
+    filesize = len(data)
+    if filesize == 772:  # CS2
+        nbcolors = min(struct.unpack_from('>H', data, 768)[0], 256)
+    else:
+        nbcolors = filesize // 3
+
+    # The color table already is the palette layout, so just slice it off.
+    return data[:nbcolors * 3]
+
+
+# Decimal text for every channel value, so GPL rows are assembled by table
+# lookup instead of integer formatting
+_DEC_SP = [b'%d ' % i for i in range(256)]
+_DEC_ROW = [b'%d\tUntitled\n' % i for i in range(256)]
+
+
+def return_gimp_palette(colors, name, columns=0):
+    """Return the bytes of a GIMP palette for palette bytes."""
+    colors = _as_palette(colors)
+    it = iter(colors)
+    rows = b''.join([
+        _DEC_SP[r] + _DEC_SP[g] + _DEC_ROW[b]
+        for r, g, b in zip(it, it, it)
+    ])
+    header = 'GIMP Palette\nName: {name}\nColumns: {columns}\n#\n'.format(
+        name=name,
+        columns=columns,
+    )
+    return header.encode('utf-8') + rows
+
+
+# ==========================================
+# GIMP GPL -> ADOBE ACT
+# ==========================================
+
+def parse_gpl_file(filename):
+    """Parse a GIMP palette file and return its palette bytes."""
+    return _parse(filename, 'gpl')
+
+
+def _read_gpl_file(filename):
+    channels = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    for line in lines:
+        # Color rows start with a digit; this skips blanks, comments and the
+        # GIMP Palette/Name:/Columns: header before any splitting is done
+        line = line.strip()
+        if not line[:1].isdecimal():
+            continue
+
+        # Look for lines with RGB values (3 or 4 numbers). Anything over three
+        # significant digits is clamped up front, so int() always gets a short string.
+        nums = []
+        for x in line.split():
+            if x.isdecimal():
+                x = x.lstrip('0') or '0'
+                nums.append(255 if len(x) > 3 else int(x))
+                if len(nums) == 3:
+                    break
+        if len(nums) == 3:
+            channels.extend(nums)
+
+    # Ensure values are in 0-255 range with one check over the whole palette.
+    # Only digit tokens are kept, so values can never be negative.
+    if channels and max(channels) > 255:
+        channels = [min(255, x) for x in channels]
+    return bytes(channels)
+
+
+def create_act_file(colors, output_filename, legacy=False):
+    """
+    Create an ACT file from palette bytes.
+    Files are written in the 772-byte CS2 layout; pass legacy=True to write
+    a full 256-color palette as the bare 768-byte color table instead.
+    """
+    colors = _as_palette(colors)
+    # Preallocate the whole file (768-byte color table + CS2 trailer) so it is
+    # filled in place and written in one call. ACT format supports max 256
+    # colors, the rest of the table stays black.
+    n = min(len(colors) // 3, 256)
+    buf = bytearray(772)
+    buf[:n * 3] = colors[:n * 3]
+
+    # CS2 trailer: color count and transparent color index (0xFFFF = none)
+    pack_into('>HH', buf, 768, n, 0xFFFF)
+
+    with open(output_filename, 'wb', buffering=0) as f:
+        f.write(memoryview(buf)[:768] if legacy and n == 256 else buf)
+
+
+# ==========================================
+# PARSE CACHE
+# ==========================================
+
+@lru_cache(maxsize=64)
+def _parse_cached(path, mtime_ns, size, kind):
+    # mtime/size are only part of the key, so an edited file misses the cache
+    return _PARSERS[kind](path)
+
+
+def _parse(filename, kind):
+    st = os.stat(filename)
+    return _parse_cached(os.path.abspath(filename), st.st_mtime_ns, st.st_size, kind)
+
+
+_PARSERS = {
+    'act': _read_adobe_act,
+    'gpl': _read_gpl_file,
+}
+
+
+# ==========================================
+# FILE CONVERSION
+# ==========================================
+
+def convert_act_to_gpl(input_path, output_path):
+    """Convert an ACT file to a GPL file and return the number of colors."""
+    colors = parse_adobe_act(input_path)
+    with open(output_path, 'wb') as f:
+        f.write(return_gimp_palette(colors, os.path.basename(output_path)))
+    return len(colors) // 3
+
+
+def convert_gpl_to_act(input_path, output_path):
+    """Convert a GPL file to an ACT file and return the number of colors."""
+    colors = parse_gpl_file(input_path)
+    if not colors:
+        raise ValueError("No valid colors found in the GPL file.")
+    create_act_file(colors, output_path)
+    return len(colors) // 3
+
+
+_CONVERTERS = {
+    '.act': convert_act_to_gpl,
+    '.gpl': convert_gpl_to_act,
+}
+
+
+def convert_file(input_path, output_path):
+    """Convert one palette file, picking the direction from its extension."""
+    ext = os.path.splitext(input_path)[1].lower()
+    if ext not in _CONVERTERS:
+        raise ValueError(f"Unsupported palette file: {input_path}")
+    return _CONVERTERS[ext](input_path, output_path)
+
+
+def _convert_pair(pair):
+    try:
+        return convert_file(*pair)
+    except Exception as e:
+        return e
+
+
+def convert_many(pairs, executor=None):
+    """
+    Convert (input_path, output_path) pairs in parallel.
+    Returns one entry per pair: the number of colors converted, or the
+    exception raised for that file. An existing executor can be shared.
+    """
+    pairs = list(pairs)
+    if executor is not None:
+        return list(executor.map(_convert_pair, pairs))
+
+    # Imported here so single-file conversions don't pay for concurrent.futures
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+        return list(ex.map(_convert_pair, pairs))